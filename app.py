@@ -1,12 +1,183 @@
 import streamlit as st
 import pandas as pd
+import atexit
 import io
 import time
+from contextlib import closing
+from collections import namedtuple
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from email_validator import EmailValidator
-from csv_processor import CSVProcessor
+from csv_processor import CSVProcessor, detect_email_columns
+
+# Validation statuses produced by EmailValidator
+STATUS_DTYPE = pd.CategoricalDtype(['Valid', 'Invalid', 'Unknown', 'Error'])
+
+# Aggregate counts shown on the Results, Metrics, Mood Ring and Recommendations tabs
+ValidationStats = namedtuple('ValidationStats', ['total', 'valid', 'invalid', 'error', 'pct'])
+
+@st.cache_data(show_spinner=False)
+def compute_stats(df: pd.DataFrame) -> ValidationStats:
+    """Compute status counts and valid percentage for a results frame in one pass."""
+    counts = df['Status'].value_counts()
+    total = len(df)
+    valid = int(counts.get('Valid', 0))
+    return ValidationStats(
+        total=total,
+        valid=valid,
+        invalid=int(counts.get('Invalid', 0)),
+        # Catch-all domains cannot be verified, so they count with the errors
+        error=int(counts.get('Error', 0)) + int(counts.get('Unknown', 0)),
+        pct=(valid / total * 100) if total > 0 else 0
+    )
+
+@st.cache_data(show_spinner=False)
+def compute_top_domains(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Email and valid-email counts for the n most frequent domains."""
+    is_valid = df['Status'] == 'Valid'
+    grp = is_valid.groupby(df['Domain'], observed=True, sort=False).agg(['size', 'sum'])
+    grp.columns = ['count', 'valid']
+    return grp.nlargest(n, 'count')
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a results frame for download, once per distinct frame."""
+    return df.to_csv(index=False).encode()
+
+# Health status thresholds: (minimum valid percentage, color, label)
+_THRESHOLDS = (
+    (95, "#10B981", "Excellent"),  # Green
+    (70, "#F59E0B", "Good"),       # Amber
+    (0, "#EF4444", "Poor")         # Red
+)
+
+def health_status(pct: float) -> tuple:
+    """Return the (color, label) pair for a valid-email percentage."""
+    return next((color, text) for threshold, color, text in _THRESHOLDS if pct >= threshold)
+
+def health_message(pct: float) -> str:
+    """Return the one-line health summary shown under the mood ring."""
+    if pct >= 90:
+        return 'Outstanding email health! Your data is in excellent condition.'
+    elif pct >= 70:
+        return 'Good email health. Most emails are valid.'
+    return 'Email health needs attention. Consider cleaning your data.'
+
+HEALTH_BANNER_TEMPLATE = """
+                <div style='background: linear-gradient(135deg, {color}20 0%, {color}10 100%); 
+                            border-left: 4px solid {color}; 
+                            padding: 15px 20px; 
+                            border-radius: 8px; 
+                            margin: 20px 0;
+                            display: flex;
+                            align-items: center;
+                            justify-content: center;'>
+                    <div style='display: flex; align-items: center; gap: 15px;'>
+                        <div style='width: 40px; height: 40px; border-radius: 50%; background-color: {color}; 
+                                    display: flex; align-items: center; justify-content: center;'>
+                            <div style='width: 16px; height: 16px; border-radius: 50%; background-color: white;'></div>
+                        </div>
+                        <div>
+                            <h3 style='margin: 0; color: {color};'>Email Health: {status}</h3>
+                            <p style='margin: 0; color: #666; font-weight: bold;'>{pct:.1f}% Valid ({total} total emails)</p>
+                        </div>
+                    </div>
+                </div>
+                """
+
+HEALTH_CARD_TEMPLATE = """
+                <div style='background-color: #f8f9fa; border: 2px solid {color}; border-radius: 12px; padding: 30px; margin: 20px 0; text-align: center;'>
+                    <div style='width: 80px; height: 80px; border-radius: 50%; border: 6px solid {color}; margin: 0 auto 20px auto; display: flex; align-items: center; justify-content: center; background-color: white;'>
+                        <div style='width: 30px; height: 30px; border-radius: 50%; background-color: {color};'></div>
+                    </div>
+                    <h2 style='color: {color}; margin: 15px 0 {gap} 0;'>{title}: {status}</h2>
+                    <h3 style='color: #666; margin: {gap} 0; font-weight: bold;'>{pct:.1f}% Valid ({total} total emails)</h3>
+                    <p style='color: #888; margin: 0; font-size: 14px;'>{message}</p>
+                </div>
+                """
+
+@st.cache_resource(show_spinner=False)
+def get_email_validator() -> EmailValidator:
+    """One validator per server process, so its worker threads, MX and catch-all caches and SMTP pool outlive a run."""
+    validator = EmailValidator(timeout=50, max_workers=5)
+    atexit.register(validator.close)  # Stop the workers and close pooled sessions at shutdown
+    return validator
+
+# Uploads may hold personal data, so only the last few parsed files are kept, and not for long
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def load_csv(file_bytes: bytes) -> pd.DataFrame:
+    """Parse uploaded CSV bytes, reusing the parsed frame across reruns."""
+    # PyArrow's reader parses multi-threaded; quoted fields may span lines as with pandas
+    try:
+        table = pacsv.read_csv(
+            io.BytesIO(file_bytes),
+            read_options=pacsv.ReadOptions(use_threads=True),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True)
+        )
+    except pa.ArrowInvalid:
+        table = None  # Ragged rows; pandas pads short rows with NaN
+    
+    # Pandas also renames duplicate headers (e, e.1) where PyArrow keeps them as-is, and rejects
+    # non-UTF-8 text up front where PyArrow would hand back binary columns of raw bytes
+    if (table is None or len(set(table.column_names)) != table.num_columns
+            or any(pa.types.is_binary(field.type) for field in table.schema)):
+        return pd.read_csv(io.BytesIO(file_bytes))
+    return table.to_pandas()
+
+# Status cell styles for the Results table, matching the reference design
+STATUS_STYLES = {
+    'Valid': 'background-color: #d4edda; color: #155724; font-weight: bold;',
+    'Invalid': 'background-color: #f8d7da; color: #721c24; font-weight: bold;',
+    'Unknown': 'background-color: #e2e3e5; color: #383d41; font-weight: bold;',
+    'Error': 'background-color: #fff3cd; color: #856404; font-weight: bold;'
+}
+
+def style_status(col: pd.Series) -> pd.Series:
+    """Map a status column to cell styles, treating unknown statuses as errors."""
+    return col.astype(object).map(STATUS_STYLES).fillna(STATUS_STYLES['Error'])
+
+@st.cache_data(show_spinner=False)
+def make_display_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Build the Results-tab table for a results frame."""
+    # Prepare display data with proper column names matching the reference
+    display_df = df.rename(columns={
+        'Email': 'email_ids',
+        'Domain': 'domain', 
+        'Status': 'status',
+        'Error': 'reason'
+    })
+    
+    # Add normalized_email column (same as email_ids for now)
+    display_df['normalized_email'] = display_df['email_ids']
+    
+    # Reorder columns to match reference exactly
+    return display_df[['email_ids', 'normalized_email', 'domain', 'status', 'reason']]
+
+@st.cache_data(show_spinner=False)
+def pie_figure(valid: int, invalid: int, error: int) -> go.Figure:
+    """Build the Metrics-tab status pie chart, omitting the Error slice when empty."""
+    labels = ['Valid', 'Invalid'] + (['Error'] if error else [])
+    values = [valid, invalid] + ([error] if error else [])
+    colors = ['#10B981', '#EF4444'] + (['#F59E0B'] if error else [])
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.4,
+        marker_colors=colors,
+        textinfo='percent',
+        textfont_size=14,
+        showlegend=False
+    )])
+    
+    fig.update_layout(
+        height=400,
+        margin=dict(t=0, b=0, l=0, r=0),
+        annotations=[dict(text='100%', x=0.5, y=0.5, font_size=20, showarrow=False)]
+    )
+    return fig
 
 def main():
     st.set_page_config(
@@ -231,12 +402,12 @@ def main():
         if uploaded_file is not None:
             try:
                 # Preview the uploaded file
-                df = pd.read_csv(uploaded_file)
+                df = load_csv(uploaded_file.getvalue())
                 st.subheader("📋 File Preview")
                 st.dataframe(df.head(10), use_container_width=True)
                 
                 # Column selection
-                email_columns = [col for col in df.columns if any(keyword in col.lower() for keyword in ['email', 'mail', 'e-mail'])]
+                email_columns = detect_email_columns(tuple(df.columns))
                 
                 if email_columns:
                     default_column = email_columns[0]
@@ -272,10 +443,12 @@ def main():
                     
                     # Initialize processors
                     csv_processor = CSVProcessor()
-                    email_validator = EmailValidator(timeout=50, max_workers=5)
                     
-                    # Extract emails
-                    emails = csv_processor.extract_emails(df, email_column)
+                    # Extract emails, grouped by domain so each domain's MX lookup is shared
+                    extracted = csv_processor.extract_email_domains(df, email_column)
+                    extracted = extracted.iloc[extracted.groupby('domain', sort=False).ngroup().argsort(kind='stable')]
+                    emails = extracted['email'].tolist()
+                    domains = extracted['domain'].tolist()
                     
                     if not emails:
                         st.error("❌ No valid email addresses found in the selected column.")
@@ -288,31 +461,61 @@ def main():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     results_container = st.empty()
+                    with results_container.container():
+                        st.subheader("🔄 Validation Progress")
+                        table_slot = st.empty()
+                    progress_table = table_slot.dataframe(
+                        pd.DataFrame(columns=['Email', 'Domain', 'Status', 'Error']),
+                        use_container_width=True
+                    )
+                    # add_rows ships only new rows to the browser; newer Streamlit releases removed it
+                    stream_rows = hasattr(progress_table, 'add_rows')
+                    batch = 10 if stream_rows else 50
                     
-                    # Validate emails
-                    results = []
-                    for i, (email, domain, status, error) in enumerate(email_validator.validate_emails_batch(emails)):
-                        results.append({
-                            'Email': email,
-                            'Domain': domain,
-                            'Status': status,
-                            'Error': error if error else ''
-                        })
-                        
-                        # Update progress
-                        progress = (i + 1) / len(emails)
-                        progress_bar.progress(progress)
-                        status_text.text(f"Processed {i + 1}/{len(emails)} emails ({progress:.1%})")
-                        
-                        # Show partial results every 10 validations
-                        if (i + 1) % 10 == 0 or i == len(emails) - 1:
-                            with results_container.container():
-                                st.subheader("🔄 Validation Progress")
-                                partial_df = pd.DataFrame(results)
-                                st.dataframe(partial_df, use_container_width=True)
+                    # Validate emails into preallocated column arrays
+                    n = len(emails)
+                    col_email = [None] * n
+                    col_domain = [None] * n
+                    col_status = [None] * n
+                    col_error = [None] * n
+                    # Closing the stream stops this run's buckets even if the loop raises or the script reruns
+                    email_validator = get_email_validator()
+                    with closing(email_validator.validate_emails_batch(emails, domains)) as results:
+                        for i, (email, domain, status, error) in enumerate(results):
+                            col_email[i] = email
+                            col_domain[i] = domain
+                            col_status[i] = status
+                            col_error[i] = error if error else ''
+                            
+                            # Update progress
+                            progress = (i + 1) / n
+                            progress_bar.progress(progress)
+                            status_text.text(f"Processed {i + 1}/{n} emails ({progress:.1%})")
+                            
+                            # Append new rows every 10 validations, or preview the latest every 50
+                            if (i + 1) % batch == 0:
+                                lo = i + 1 - batch if stream_rows else max(0, i - 19)
+                                new_rows = pd.DataFrame({
+                                    'Email': col_email[lo:i + 1],
+                                    'Domain': col_domain[lo:i + 1],
+                                    'Status': col_status[lo:i + 1],
+                                    'Error': col_error[lo:i + 1]
+                                })
+                                if stream_rows:
+                                    progress_table.add_rows(new_rows)
+                                else:
+                                    table_slot.dataframe(new_rows, use_container_width=True)
                     
                     # Store results in session state
-                    st.session_state.validation_results = pd.DataFrame(results)
+                    results_df = pd.DataFrame({
+                        'Email': col_email,
+                        'Domain': col_domain,
+                        'Status': col_status,
+                        'Error': col_error
+                    })
+                    results_df['Status'] = results_df['Status'].astype(STATUS_DTYPE)
+                    results_df['Domain'] = results_df['Domain'].astype('category')
+                    st.session_state.validation_results = results_df
                     st.session_state.processing = False
                     
                     # Clear progress indicators
@@ -331,86 +534,30 @@ def main():
         # Results view matching reference design
         if st.session_state.validation_results is not None:
             results_df = st.session_state.validation_results
-            total_emails = len(results_df)
-            valid_emails = len(results_df[results_df['Status'] == 'Valid'])
-            invalid_emails = len(results_df[results_df['Status'] == 'Invalid'])
-            error_emails = len(results_df[results_df['Status'] == 'Error'])
-            valid_percentage = (valid_emails / total_emails * 100) if total_emails > 0 else 0
+            total_emails, valid_emails, invalid_emails, error_emails, valid_percentage = compute_stats(results_df)
             
             # Header with icon
             st.markdown("# 📊 Email Validation Results")
             
             # Health status bar with updated color thresholds
-            if valid_percentage >= 95:
-                status_color = "#10B981"  # Green
-                status_text = "Excellent"
-            elif valid_percentage >= 70:
-                status_color = "#F59E0B"  # Amber
-                status_text = "Good"
-            else:
-                status_color = "#EF4444"  # Red
-                status_text = "Poor"
-            
+            status_color, status_text = health_status(valid_percentage)
             st.markdown(
-                f"""
-                <div style='background: linear-gradient(135deg, {status_color}20 0%, {status_color}10 100%); 
-                            border-left: 4px solid {status_color}; 
-                            padding: 15px 20px; 
-                            border-radius: 8px; 
-                            margin: 20px 0;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;'>
-                    <div style='display: flex; align-items: center; gap: 15px;'>
-                        <div style='width: 40px; height: 40px; border-radius: 50%; background-color: {status_color}; 
-                                    display: flex; align-items: center; justify-content: center;'>
-                            <div style='width: 16px; height: 16px; border-radius: 50%; background-color: white;'></div>
-                        </div>
-                        <div>
-                            <h3 style='margin: 0; color: {status_color};'>Email Health: {status_text}</h3>
-                            <p style='margin: 0; color: #666; font-weight: bold;'>{valid_percentage:.1f}% Valid ({total_emails} total emails)</p>
-                        </div>
-                    </div>
-                </div>
-                """, 
+                HEALTH_BANNER_TEMPLATE.format(
+                    color=status_color, status=status_text, pct=valid_percentage, total=total_emails
+                ),
                 unsafe_allow_html=True
             )
             
             # Validation Results section
             st.subheader("Validation Results")
             
-            # Prepare display data with proper column names matching the reference
-            display_df = results_df.copy()
-            display_df = display_df.rename(columns={
-                'Email': 'email_ids',
-                'Domain': 'domain', 
-                'Status': 'status',
-                'Error': 'reason'
-            })
-            
-            # Add normalized_email column (same as email_ids for now)
-            display_df['normalized_email'] = display_df['email_ids']
-            
-            # Reorder columns to match reference exactly
-            display_df = display_df[['email_ids', 'normalized_email', 'domain', 'status', 'reason']]
-            
-            # Color coding for status matching reference design
-            def style_status(val):
-                if val == 'Valid':
-                    return 'background-color: #d4edda; color: #155724; font-weight: bold;'
-                elif val == 'Invalid':
-                    return 'background-color: #f8d7da; color: #721c24; font-weight: bold;'
-                else:
-                    return 'background-color: #fff3cd; color: #856404; font-weight: bold;'
-            
             # Apply styling and display with index column visible
-            styled_df = display_df.style.map(style_status, subset=['status'])
+            display_df = make_display_results(results_df)
+            styled_df = display_df.style.apply(style_status, subset=['status'])
             st.dataframe(styled_df, use_container_width=True, height=400)
             
             # Download button at bottom left corner
-            csv_buffer = io.StringIO()
-            results_df.to_csv(csv_buffer, index=False)
-            csv_data = csv_buffer.getvalue()
+            csv_data = to_csv_bytes(results_df)
             
             col1, col2, col3 = st.columns([1, 2, 2])
             with col1:
@@ -428,11 +575,7 @@ def main():
         # Metrics view matching reference design
         if st.session_state.validation_results is not None:
             results_df = st.session_state.validation_results
-            total_emails = len(results_df)
-            valid_emails = len(results_df[results_df['Status'] == 'Valid'])
-            invalid_emails = len(results_df[results_df['Status'] == 'Invalid'])
-            error_emails = len(results_df[results_df['Status'] == 'Error'])
-            valid_percentage = (valid_emails / total_emails * 100) if total_emails > 0 else 0
+            total_emails, valid_emails, invalid_emails, error_emails, valid_percentage = compute_stats(results_df)
             
             # Header with icon
             st.markdown("# 📊 Email Validation Metrics")
@@ -441,27 +584,12 @@ def main():
             st.subheader("Validation Metrics")
             
             # Email Health Mood Ring with updated color thresholds
-            if valid_percentage >= 95:
-                status_color = "#10B981"  # Green
-                status_text = "Excellent"
-            elif valid_percentage >= 70:
-                status_color = "#F59E0B"  # Amber
-                status_text = "Good"
-            else:
-                status_color = "#EF4444"  # Red
-                status_text = "Poor"
-            
+            status_color, status_text = health_status(valid_percentage)
             st.markdown(
-                f"""
-                <div style='background-color: #f8f9fa; border: 2px solid {status_color}; border-radius: 12px; padding: 30px; margin: 20px 0; text-align: center;'>
-                    <div style='width: 80px; height: 80px; border-radius: 50%; border: 6px solid {status_color}; margin: 0 auto 20px auto; display: flex; align-items: center; justify-content: center; background-color: white;'>
-                        <div style='width: 30px; height: 30px; border-radius: 50%; background-color: {status_color};'></div>
-                    </div>
-                    <h2 style='color: {status_color}; margin: 15px 0 5px 0;'>Mood Ring Status: {status_text}</h2>
-                    <h3 style='color: #666; margin: 5px 0; font-weight: bold;'>{valid_percentage:.1f}% Valid ({total_emails} total emails)</h3>
-                    <p style='color: #888; margin: 0; font-size: 14px;'>{'Outstanding email health! Your data is in excellent condition.' if valid_percentage >= 90 else 'Good email health. Most emails are valid.' if valid_percentage >= 70 else 'Email health needs attention. Consider cleaning your data.'}</p>
-                </div>
-                """, 
+                HEALTH_CARD_TEMPLATE.format(
+                    color=status_color, title="Mood Ring Status", status=status_text, gap="5px",
+                    pct=valid_percentage, total=total_emails, message=health_message(valid_percentage)
+                ),
                 unsafe_allow_html=True
             )
             
@@ -471,23 +599,7 @@ def main():
             with col1:
                 st.subheader("Email Counts")
                 # Create pie chart
-                fig = go.Figure(data=[go.Pie(
-                    labels=['Valid', 'Invalid', 'Error'] if error_emails > 0 else ['Valid', 'Invalid'],
-                    values=[valid_emails, invalid_emails, error_emails] if error_emails > 0 else [valid_emails, invalid_emails],
-                    hole=0.4,
-                    marker_colors=['#10B981', '#EF4444', '#F59E0B'] if error_emails > 0 else ['#10B981', '#EF4444'],
-                    textinfo='percent',
-                    textfont_size=14,
-                    showlegend=False
-                )])
-                
-                fig.update_layout(
-                    height=400,
-                    margin=dict(t=0, b=0, l=0, r=0),
-                    annotations=[dict(text='100%', x=0.5, y=0.5, font_size=20, showarrow=False)]
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(pie_figure(valid_emails, invalid_emails, error_emails), use_container_width=True)
             
             with col2:
                 st.subheader("Email Metrics")
@@ -536,41 +648,19 @@ def main():
         # Email Health Dashboard (previously dashboard view)
         if st.session_state.validation_results is not None:
             results_df = st.session_state.validation_results
-            total_emails = len(results_df)
-            valid_emails = len(results_df[results_df['Status'] == 'Valid'])
-            invalid_emails = len(results_df[results_df['Status'] == 'Invalid'])
-            error_emails = len(results_df[results_df['Status'] == 'Error'])
+            # Calculate counts and health status with updated color thresholds
+            total_emails, valid_emails, invalid_emails, error_emails, valid_percentage = compute_stats(results_df)
             
-            # Calculate health status with updated color thresholds
-            valid_percentage = (valid_emails / total_emails * 100) if total_emails > 0 else 0
-            
-            if valid_percentage >= 95:
-                status_color = "#10B981"  # Green
-                status_text = "Excellent"
-                ring_color = "#10B981"
-            elif valid_percentage >= 70:
-                status_color = "#F59E0B"  # Amber
-                status_text = "Good"
-                ring_color = "#F59E0B"
-            else:
-                status_color = "#EF4444"  # Red
-                status_text = "Poor"
-                ring_color = "#EF4444"
+            status_color, status_text = health_status(valid_percentage)
             
             st.header("🎯 Email Health Mood Ring")
             
             # Health Status Card
             st.markdown(
-                f"""
-                <div style='background-color: #f8f9fa; border: 2px solid {status_color}; border-radius: 12px; padding: 30px; margin: 20px 0; text-align: center;'>
-                    <div style='width: 80px; height: 80px; border-radius: 50%; border: 6px solid {ring_color}; margin: 0 auto 20px auto; display: flex; align-items: center; justify-content: center; background-color: white;'>
-                        <div style='width: 30px; height: 30px; border-radius: 50%; background-color: {ring_color};'></div>
-                    </div>
-                    <h2 style='color: {status_color}; margin: 15px 0 10px 0;'>Email Health Status: {status_text}</h2>
-                    <h3 style='color: #666; margin: 10px 0; font-weight: bold;'>{valid_percentage:.1f}% Valid ({total_emails} total emails)</h3>
-                    <p style='color: #888; margin: 0; font-size: 14px;'>{'Outstanding email health! Your data is in excellent condition.' if valid_percentage >= 90 else 'Good email health. Most emails are valid.' if valid_percentage >= 70 else 'Email health needs attention. Consider cleaning your data.'}</p>
-                </div>
-                """, 
+                HEALTH_CARD_TEMPLATE.format(
+                    color=status_color, title="Email Health Status", status=status_text, gap="10px",
+                    pct=valid_percentage, total=total_emails, message=health_message(valid_percentage)
+                ),
                 unsafe_allow_html=True
             )
             
@@ -606,11 +696,7 @@ def main():
         # Recommendations view
         if st.session_state.validation_results is not None:
             results_df = st.session_state.validation_results
-            total_emails = len(results_df)
-            valid_emails = len(results_df[results_df['Status'] == 'Valid'])
-            invalid_emails = len(results_df[results_df['Status'] == 'Invalid'])
-            error_emails = len(results_df[results_df['Status'] == 'Error'])
-            valid_percentage = (valid_emails / total_emails * 100) if total_emails > 0 else 0
+            total_emails, valid_emails, invalid_emails, error_emails, valid_percentage = compute_stats(results_df)
             
             st.header("🔧 Recommendations")
             
@@ -639,11 +725,10 @@ def main():
             
             # Domain-specific recommendations
             st.subheader("Domain Analysis")
-            domain_counts = results_df['Domain'].value_counts()
+            top_domains = compute_top_domains(results_df)
             
             st.write("**Top domains in your list:**")
-            for domain, count in domain_counts.head(5).items():
-                domain_valid = len(results_df[(results_df['Domain'] == domain) & (results_df['Status'] == 'Valid')])
+            for domain, count, domain_valid in top_domains.itertuples():
                 domain_rate = (domain_valid / count * 100) if count > 0 else 0
                 
                 if domain_rate >= 90:
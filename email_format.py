@@ -0,0 +1,78 @@
+import numpy as np
+from typing import List
+
+try:
+    import numba  # Optional JIT for the bulk format check
+except ImportError:
+    numba = None
+
+# Character-class bitmasks mirroring the email regex character sets
+_LOCAL_CHAR = 1   # [a-zA-Z0-9._%+-]
+_DOMAIN_CHAR = 2  # [a-zA-Z0-9.-]
+_ALPHA_CHAR = 4   # [a-zA-Z]
+
+_CHAR_CLASSES = np.zeros(256, dtype=np.uint8)
+for _c in b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+    _CHAR_CLASSES[_c] = _LOCAL_CHAR | _DOMAIN_CHAR | _ALPHA_CHAR
+for _c in b'0123456789.-':
+    _CHAR_CLASSES[_c] = _LOCAL_CHAR | _DOMAIN_CHAR
+for _c in b'_%+':
+    _CHAR_CLASSES[_c] = _LOCAL_CHAR
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _scan_email_format(buf, starts, lengths, classes, out):
+        """Match each row of buf against the email regex grammar."""
+        for row in numba.prange(starts.shape[0]):
+            start = starts[row]
+            end = start + lengths[row]
+            at = -1
+            ok = True
+            for i in range(start, end):
+                c = buf[i]
+                if c == 64:  # '@'
+                    if at != -1:
+                        ok = False
+                        break
+                    at = i
+                elif at == -1:
+                    if not classes[c] & 1:
+                        ok = False
+                        break
+                elif not classes[c] & 2:
+                    ok = False
+                    break
+            
+            # Need a non-empty local part and a domain part
+            if not ok or at <= start:
+                out[row] = False
+                continue
+            
+            # The TLD follows the last dot and needs at least two letters
+            dot = -1
+            for i in range(end - 1, at, -1):
+                if buf[i] == 46:  # '.'
+                    dot = i
+                    break
+            if dot <= at + 1 or end - dot - 1 < 2:
+                out[row] = False
+                continue
+            for i in range(dot + 1, end):
+                if not classes[buf[i]] & 4:
+                    ok = False
+                    break
+            out[row] = ok
+
+NUMBA_AVAILABLE = numba is not None
+
+def scan_email_formats(emails: List[str]) -> np.ndarray:
+    """Check the basic email format of every string with the compiled scanner (requires numba)."""
+    # Non-ASCII characters become '?' so byte offsets equal character offsets
+    lengths = np.fromiter(map(len, emails), dtype=np.int64, count=len(emails))
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=starts[1:])
+    buf = np.frombuffer('\n'.join(emails).encode('ascii', 'replace'), dtype=np.uint8)
+    
+    out = np.empty(len(lengths), dtype=np.bool_)
+    _scan_email_format(buf, starts, lengths, _CHAR_CLASSES, out)
+    return out
@@ -1,92 +1,509 @@
 import smtplib
+import dns.exception
+import dns.name
 import dns.resolver
+import dns.asyncresolver
+import os
 import socket
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Tuple, Generator
+import asyncio
+import atexit
+import errno
+import itertools
+import secrets
+import selectors
+import threading
+import queue
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Generator, AsyncGenerator
 import time
 
+from email_format import NUMBA_AVAILABLE, scan_email_formats
+
+try:
+    import aiodns  # Optional: asyncio DNS resolver for validate_emails_batch_async
+    import aiosmtplib  # Optional: asyncio SMTP client for validate_emails_batch_async
+    import pycares  # aiodns's backend
+except ImportError:
+    aiodns = None
+    aiosmtplib = None
+else:
+    # Lookups use query_dns and its pycares 5 DNSResult records (aiodns 4+); older releases stay unused
+    if not (hasattr(aiodns.DNSResolver, 'query_dns') and hasattr(pycares, 'DNSResult')):
+        aiodns = None
+
+ASYNC_AVAILABLE = aiodns is not None and aiosmtplib is not None
+
+# Compiled once at import; re.ASCII keeps the engine off the Unicode character tables
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.ASCII)
+
+# Address halves checked separately once the address is split at its last '@' (input is lowercased first)
+_LOCAL_RE = re.compile(r'[a-z0-9._%+-]+', re.ASCII)
+_DOMAIN_RE = re.compile(r'[a-z0-9.-]+\.[a-z]{2,}', re.ASCII)
+
+def _domain_malformed(domain: str) -> bool:
+    """Reject single-label, empty-label, one-letter-TLD and over-long domains with string checks alone."""
+    if '.' not in domain or domain.startswith('.') or domain.endswith('.') or '..' in domain:
+        return True
+    labels = domain.split('.')
+    return len(domain) > 253 or len(labels[-1]) < 2 or max(len(label) for label in labels) > 63
+
+def _address_ok(email: str, domain: str, domain_ok: bool) -> bool:
+    """Syntax-check an address split at its last '@', reusing its bucket's domain verdict when the domains agree."""
+    at = email.rfind('@')
+    if at <= 0 or _LOCAL_RE.fullmatch(email, 0, at) is None:
+        return False
+    if len(email) - at - 1 == len(domain) and email.endswith(domain):
+        return domain_ok
+    return _DOMAIN_RE.fullmatch(email, at + 1) is not None
+
+# Lookup outcomes meaning the domain cannot receive mail (malformed names included); these are negative-cached
+_DNS_MISSING = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.SyntaxError, dns.name.NameTooLong)
+_DNS_TRANSIENT = (dns.resolver.NoNameservers, dns.exception.Timeout)
+
+# The same split for aiodns error codes; every other code (timeout, SERVFAIL, refused) is transient
+_ARES_MISSING = frozenset({
+    aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA, aiodns.error.ARES_EBADNAME,
+}) if aiodns is not None else frozenset()
+
+def _is_failure(result: Tuple[str, str, str, str]) -> bool:
+    """Whether a result means the check itself failed (server error, refused connection) rather than a verdict."""
+    return result[2] == 'Error' or result[3].startswith(('SMTP error', 'Could not connect'))
+
+class _DNSTransient(Exception):
+    """An MX lookup failed for a reason worth retrying (timeout, no nameserver answered)."""
+
+# Major providers with stable MX topology; their catch-all/tarpit behaviour makes RCPT probing unreliable
+TRUSTED_DOMAINS = frozenset({
+    'gmail.com', 'googlemail.com', 'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'yahoo.com', 'ymail.com', 'aol.com', 'icloud.com', 'me.com', 'mac.com',
+    'protonmail.com', 'proton.me', 'gmx.com', 'zoho.com', 'yandex.com',
+})
+
+class _ProbedSMTP(smtplib.SMTP):
+    """SMTP client whose TCP connect is bounded by a short non-blocking probe, so dead MX hosts fail fast."""
+    
+    probe_timeout = 1.0  # Seconds to wait for the TCP handshake, independent of the command timeout
+    # connect_ex results meaning the handshake is under way; anything else (ENETUNREACH, ...) failed outright
+    _pending = frozenset({0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)})
+    
+    def _get_socket(self, host, port, timeout):
+        error = OSError(f'Could not resolve {host}')
+        for family, sock_type, proto, _, address in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, sock_type, proto)
+            try:
+                if self.source_address:
+                    sock.bind(self.source_address)
+                sock.setblocking(False)
+                err = sock.connect_ex(address)
+                if err not in self._pending:
+                    raise OSError(err, os.strerror(err))
+                with selectors.DefaultSelector() as selector:
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    if not selector.select(self.probe_timeout):
+                        raise socket.timeout(f'TCP connect to {host}:{port} timed out')
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err:
+                    raise OSError(err, os.strerror(err))
+            except OSError as e:
+                sock.close()
+                error = e
+                continue
+            
+            if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+                sock.setblocking(True)
+            else:
+                sock.settimeout(timeout)
+            # SMTP commands are small request/response packets; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+        raise error
+
+class _SMTPPool:
+    """Idle SMTP sessions keyed by MX host, reused across emails to skip the connect/HELO handshake."""
+    
+    def __init__(self, timeout: int, max_idle: float = 100.0, max_uses: int = 100, ping_after: float = 15.0):
+        self.timeout = timeout
+        self.max_idle = max_idle  # Seconds an idle session is kept before reconnecting
+        self.max_uses = max_uses  # Recipients probed on one session before it is closed
+        self.ping_after = ping_after  # Idle seconds after which a session is checked with NOOP before reuse
+        self._idle = defaultdict(deque)  # MX host -> deque of (server, last_used, uses)
+        self._lock = threading.Lock()
+    
+    def acquire(self, mx_server: str, recipients: int = 1) -> Tuple[smtplib.SMTP, int]:
+        """Return a ready SMTP session to mx_server with room for recipients more, and how many it has probed."""
+        while True:
+            # Most recently used first; sessions too close to max_uses stay idle for a smaller transaction
+            with self._lock:
+                idle = self._idle[mx_server]
+                entry = next((e for e in reversed(idle) if e[2] + recipients <= self.max_uses), None)
+                if entry is not None:
+                    idle.remove(entry)
+            if entry is None:
+                break
+            
+            server, last_used, uses = entry
+            idle_for = time.monotonic() - last_used
+            if idle_for < self.max_idle and (idle_for < self.ping_after or self._alive(server)):
+                return server, uses
+            self._close(server)
+        
+        # Create SMTP connection with timeout (the TCP handshake itself is capped by the probe); EHLO lets the server advertise PIPELINING
+        server = _ProbedSMTP(local_hostname='validator.local', timeout=self.timeout)
+        server.set_debuglevel(0)
+        try:
+            server.connect(mx_server, 25)
+            self._enable_keepalive(server.sock)
+            server.ehlo_or_helo_if_needed()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+            raise
+        return server, 0
+    
+    def release(self, mx_server: str, server: smtplib.SMTP, uses: int):
+        """Reset the session's mail transaction and return it to the pool."""
+        if uses >= self.max_uses:
+            self._close(server)
+            return
+        try:
+            code, _ = server.rset()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+            return
+        if code != 250:
+            self._close(server)
+            return
+        with self._lock:
+            self._idle[mx_server].append((server, time.monotonic(), uses))
+    
+    def discard(self, server: smtplib.SMTP):
+        """Close a session that can no longer be reused."""
+        self._close(server)
+    
+    def close(self, mx_server: Optional[str] = None):
+        """Close every idle session, or only those to mx_server."""
+        with self._lock:
+            if mx_server is None:
+                servers = [server for idle in self._idle.values() for server, _, _ in idle]
+                self._idle.clear()
+            else:
+                servers = [server for server, _, _ in self._idle.pop(mx_server, ())]
+        for server in servers:
+            self._close(server)
+    
+    @staticmethod
+    def _alive(server: smtplib.SMTP) -> bool:
+        """Check an idle session with NOOP."""
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    @staticmethod
+    def _enable_keepalive(sock: socket.socket):
+        """Have the OS probe idle pooled connections so dead peers are noticed early."""
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):  # Not available on every platform
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+    
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
 class EmailValidator:
-    def __init__(self, timeout: int = 10, max_workers: int = 5):
+    def __init__(self, timeout: int = 10, max_workers: int = 5, trusted_domains: Optional[Iterable[str]] = None,
+                 neg_ttl: float = 60.0):
         self.timeout = timeout
         self.max_workers = max_workers
-        self.email_regex = re.compile(
-            r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        )
+        # Addresses on these domains are accepted on syntax alone, skipping MX and SMTP checks
+        self._trusted_domains = TRUSTED_DOMAINS if trusted_domains is None else frozenset(d.lower() for d in trusted_domains)
+        # MX lookups are cached per domain: domain -> (expires_at, records), least recently used first
+        self.mx_cache_size = 1024
+        self.mx_ttl = 300.0  # Upper bound in seconds; the record's own TTL is used if shorter
+        self._mx_cache = OrderedDict()
+        # Domains with no MX records (NXDOMAIN/NoAnswer) get their own, larger cache so typo'd
+        # domains on dirty lists cost one lookup each without evicting good answers
+        self.neg_cache_size = 2048
+        self.neg_ttl = neg_ttl
+        self._neg_cache = OrderedDict()
+        self._mx_lock = threading.Lock()
+        # Whether a domain's MX accepts any mailbox: domain -> (expires_at, verdict), guarded by _mx_lock
+        self.catch_all_ttl = 3600.0
+        self._catch_all = OrderedDict()
+        self.dns_lifetime = 3.0  # Bounds the wait on a cache miss
+        # One resolver for all lookups: config is read once and its thread-safe cache honours record TTLs
+        self._resolver = dns.resolver.Resolver()
+        self._resolver.cache = dns.resolver.LRUCache(4096)
+        self._resolver.lifetime = self.dns_lifetime
+        self._resolver.timeout = min(timeout, self.dns_lifetime)
+        self.dns_retries = 1  # Extra attempts after a timeout or SERVFAIL from every nameserver
+        self.dns_concurrency = 100  # MX queries in flight at once during a batch's prefetch
+        self._pool = _SMTPPool(timeout)
+        # Compiled format scanner for the bulk syntax pass, when numba is installed
+        self._fast_filter = scan_email_formats if NUMBA_AVAILABLE else None
+        # An MX host is skipped for the rest of a batch once this many of its results are in and more than this share failed
+        self.abort_min_results = 30
+        self.abort_failure_rate = 0.33
+        self.batch_window = 10000  # Addresses read from the input and validated together
+        # Worker threads are kept across batches, like the MX cache and SMTP pool they share
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='email-val')
+        atexit.register(self._executor.shutdown)
+    
+    def close(self):
+        """Stop the worker threads and close any pooled SMTP connections."""
+        atexit.unregister(self._executor.shutdown)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def is_valid_email_syntax(self, email: str) -> bool:
         """Check if email has valid syntax using regex."""
-        return bool(self.email_regex.match(email.strip()))
+        return _EMAIL_RE.match(email.strip()) is not None
+    
+    def filter_syntax_bulk(self, emails: List[str]) -> List[bool]:
+        """Syntax-check many normalized addresses at once, on the numba scanner when installed."""
+        if self._fast_filter is not None and emails:
+            return self._fast_filter(emails).tolist()
+        
+        match = _EMAIL_RE.match
+        return [match(email) is not None for email in emails]
     
     def get_mx_records(self, domain: str) -> List[str]:
-        """Get MX records for a domain."""
+        """Get MX records for a domain, served from the TTL-bounded cache when fresh."""
+        records = self._cached_mx(domain)
+        if records is not None:
+            return records
+        
+        # Retry a transient failure once after a short backoff before reporting it
+        for attempt in range(self.dns_retries + 1):
+            try:
+                return self._query_mx(domain)
+            except _DNSTransient:
+                if attempt == self.dns_retries:
+                    raise
+                time.sleep(0.25 * 2 ** attempt)
+    
+    def _query_mx(self, domain: str) -> List[str]:
+        """Resolve a domain's MX records, caching the answer or the domain's absence."""
+        now = time.monotonic()
         try:
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            return [str(mx.exchange).rstrip('.') for mx in mx_records]
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.LifetimeTimeout, Exception):
+            # Absolute name without the search list, so no suffixed variants are queried
+            mx_records = self._resolver.resolve(domain.rstrip('.') + '.', 'MX', search=False)
+        except _DNS_MISSING:
+            self._cache_mx(self._neg_cache, domain, now + self.neg_ttl, [], self.neg_cache_size)
             return []
+        except _DNS_TRANSIENT as e:
+            raise _DNSTransient(f'DNS lookup failed for {domain}: {e}') from e
+        
+        return self._store_mx_answer(domain, now, mx_records)
+    
+    async def _resolve_all_mx(self, domains) -> Dict[str, List[str]]:
+        """Resolve MX records for many domains concurrently, filling the shared MX cache."""
+        resolver = dns.asyncresolver.Resolver()
+        resolver.cache = self._resolver.cache
+        resolver.lifetime = self._resolver.lifetime
+        resolver.timeout = self._resolver.timeout
+        
+        limit = asyncio.Semaphore(self.dns_concurrency)
+        
+        async def resolve(domain: str) -> Tuple[str, List[str]]:
+            now = time.monotonic()
+            try:
+                async with limit:
+                    mx_records = await resolver.resolve(domain.rstrip('.') + '.', 'MX', search=False)
+            except _DNS_MISSING:
+                self._cache_mx(self._neg_cache, domain, now + self.neg_ttl, [], self.neg_cache_size)
+                return domain, []
+            except dns.exception.DNSException:
+                return domain, []  # Not cached; bucket workers look the domain up again
+            return domain, self._store_mx_answer(domain, now, mx_records)
+        
+        return dict(await asyncio.gather(*(resolve(domain) for domain in domains)))
+    
+    def _prefetch_mx(self, domains) -> Dict[str, List[str]]:
+        """Run _resolve_all_mx to completion on a private event loop."""
+        return asyncio.run(self._resolve_all_mx(domains))
+    
+    def _cached_mx(self, domain: str) -> Optional[List[str]]:
+        """Return the cached MX records for a domain, or None when absent or expired."""
+        now = time.monotonic()
+        with self._mx_lock:
+            for cache in (self._mx_cache, self._neg_cache):
+                entry = cache.get(domain)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(domain)
+                    return entry[1]
+        return None
+    
+    def _catch_all_verdict(self, domain: str) -> Optional[bool]:
+        """Return the cached catch-all verdict for a domain, or None when unknown or expired."""
+        now = time.monotonic()
+        with self._mx_lock:
+            entry = self._catch_all.get(domain)
+            if entry is not None and entry[0] > now:
+                self._catch_all.move_to_end(domain)
+                return entry[1]
+        return None
+    
+    def _record_catch_all(self, domain: str, accepted: bool, reason: str) -> bool:
+        """Cache the random-mailbox probe's verdict when the server answered definitively."""
+        if accepted or reason in ('Mailbox not found', 'Invalid email format') or reason.startswith('SMTP error: 5'):
+            with self._mx_lock:
+                self._catch_all[domain] = (time.monotonic() + self.catch_all_ttl, accepted)
+                self._catch_all.move_to_end(domain)
+                if len(self._catch_all) > self.mx_cache_size:
+                    self._catch_all.popitem(last=False)
+        return accepted
+    
+    def _store_mx_answer(self, domain: str, now: float, mx_records) -> List[str]:
+        """Cache an MX answer for at most its own TTL and return the exchange hosts, most preferred first."""
+        records = [host for _, host in sorted(
+            (mx.preference, mx.exchange.to_text(omit_final_dot=True).lower()) for mx in mx_records
+        )]
+        ttl = min(self.mx_ttl, mx_records.rrset.ttl)
+        self._cache_mx(self._mx_cache, domain, now + ttl, records, self.mx_cache_size)
+        return records
+    
+    def _cache_mx(self, cache: OrderedDict, domain: str, expires_at: float, records: List[str], max_size: int):
+        """Store an MX lookup result, evicting the least recently used domain when full."""
+        with self._mx_lock:
+            cache[domain] = (expires_at, records)
+            cache.move_to_end(domain)
+            if len(cache) > max_size:
+                cache.popitem(last=False)
     
     def validate_smtp(self, email: str, mx_servers: List[str]) -> Tuple[bool, str]:
-        """Validate email using SMTP connection."""
+        """Validate email using a pooled SMTP connection."""
         if not mx_servers:
             return False, "No MX records found"
         
-        for mx_server in mx_servers[:3]:  # Try up to 3 MX servers
+        # Exhaust the bucket so its session is released back to the pool
+        [(_, is_valid, message)] = list(self.validate_smtp_bucket([email], mx_servers))
+        return is_valid, message
+    
+    def validate_smtp_bucket(self, emails: List[str], mx_servers: List[str], probe_first: bool = False) -> Generator[Tuple[str, bool, str], None, None]:
+        """Validate addresses on one domain in SMTP transactions of at most max_uses recipients, yielding each RCPT result.
+        
+        With probe_first, the first address's RCPT is answered before any other recipient is sent."""
+        size = self._pool.max_uses
+        for lo in range(0, len(emails), size):
+            pending = deque(emails[lo:lo + size])
+            for mx_server in mx_servers[:3]:  # Try up to 3 MX servers
+                alone = probe_first and lo == 0 and len(pending) == min(size, len(emails))
+                for email, reply in self._probe_rcpts(mx_server, list(pending), alone):
+                    pending.popleft()
+                    yield (email,) + self._rcpt_result(*reply)
+                if not pending:
+                    break
+            
+            for email in pending:
+                yield email, False, "Could not connect to any MX server"
+    
+    def _probe_rcpts(self, mx_server: str, emails: List[str], probe_first: bool = False) -> Generator[Tuple[str, Tuple[int, bytes]], None, None]:
+        """Send MAIL FROM once and RCPT TO per address on a pooled connection; stops if the server fails."""
+        for _ in range(2):  # A stale pooled connection gets one retry on a fresh one
             try:
-                # Create SMTP connection with timeout
-                server = smtplib.SMTP(timeout=self.timeout)
-                server.set_debuglevel(0)
-                
-                # Connect to MX server
-                server.connect(mx_server, 25)
-                server.helo('validator.local')
-                
-                # Try to start mail transaction
-                code, message = server.mail('test@validator.local')
-                if code != 250:
-                    server.quit()
-                    continue
-                
-                # Try to validate recipient
-                code, message = server.rcpt(email)
-                server.quit()
-                
-                if code == 250:
-                    return True, "SMTP validation successful"
-                elif code == 550:
-                    return False, "Mailbox not found"
-                elif code == 553:
-                    return False, "Invalid email format"
-                else:
-                    return False, f"SMTP error: {code} {message.decode() if isinstance(message, bytes) else message}"
+                server, uses = self._pool.acquire(mx_server, len(emails))
+            except (smtplib.SMTPException, OSError):
+                return
             
-            except smtplib.SMTPConnectError:
-                continue  # Try next MX server
-            except smtplib.SMTPTimeoutError:
-                continue  # Try next MX server
-            except smtplib.SMTPRecipientsRefused:
-                return False, "Email rejected by server"
+            # Try to start mail transaction
+            replies = self.rcpt_transaction(server, emails, probe_first)
+            try:
+                code, message = next(replies)
             except smtplib.SMTPServerDisconnected:
-                continue  # Try next MX server
-            except Exception as e:
-                continue  # Try next MX server
+                code = 421
+            except (smtplib.SMTPException, OSError):
+                self._pool.discard(server)
+                return
+            if code == 250:
+                break
+            
+            self._pool.discard(server)
+            if code != 421 or uses == 0:  # 421: server timed out an idle pooled session
+                return
+        else:
+            return
+        
+        # Try to validate each recipient
+        completed = False
+        try:
+            for email, reply in zip(emails, replies):
+                uses += 1
+                yield email, reply
+            completed = True
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            if completed:
+                self._pool.release(mx_server, server, uses)
+            else:
+                self._pool.discard(server)
+    
+    def rcpt_transaction(self, server: smtplib.SMTP, emails: List[str], probe_first: bool = False) -> Generator[Tuple[int, bytes], None, None]:
+        """Send MAIL FROM and RCPT TO per address on an open session, yielding the MAIL reply then each RCPT reply.
         
-        return False, "Could not connect to any MX server"
+        Servers advertising PIPELINING get every command in a single write, so the whole
+        transaction costs one round trip instead of one per command. With probe_first, MAIL and
+        the first RCPT go out alone and the rest only once that reply has been consumed.
+        """
+        if server.has_extn('pipelining'):
+            commands = ['mail FROM:<test@validator.local>'] + [f'rcpt TO:{smtplib.quoteaddr(email)}' for email in emails]
+            if any('\r' in command or '\n' in command for command in commands):
+                raise ValueError("Email addresses must not contain line breaks")
+            head = 2 if probe_first else len(commands)
+            for batch in (commands[:head], commands[head:]):
+                if batch:
+                    server.send(''.join(command + '\r\n' for command in batch))
+                    for _ in batch:
+                        yield server.getreply()
+        else:
+            yield server.mail('test@validator.local')
+            for email in emails:
+                yield server.rcpt(email)
     
-    def validate_single_email(self, email: str) -> Tuple[str, str, str, str]:
-        """Validate a single email address."""
+    def _rcpt_result(self, code: int, message) -> Tuple[bool, str]:
+        """Interpret the server's reply to RCPT TO."""
+        if code == 250:
+            return True, "SMTP validation successful"
+        elif code == 550:
+            return False, "Mailbox not found"
+        elif code == 553:
+            return False, "Invalid email format"
+        else:
+            return False, f"SMTP error: {code} {message.decode() if isinstance(message, bytes) else message}"
+    
+    def validate_single_email(self, email: str, domain: Optional[str] = None) -> Tuple[str, str, str, str]:
+        """Validate a single email address, optionally with its already-extracted domain."""
         email = email.strip().lower()
         
-        # Extract domain
-        try:
-            domain = email.split('@')[1]
-        except IndexError:
-            return email, '', 'Invalid', 'Invalid email format'
+        # Split at the last '@' once; the halves are syntax-checked without another walk of the address
+        at = email.rfind('@')
+        if at <= 0 or at == len(email) - 1:
+            return email, domain or '', 'Invalid', 'Invalid email format'
+        local, email_domain = email[:at], email[at + 1:]
+        if domain is None:
+            domain = email_domain
+        
+        if _domain_malformed(domain):
+            return email, domain, 'Invalid', 'Malformed domain'
         
         # Check syntax
-        if not self.is_valid_email_syntax(email):
+        if _LOCAL_RE.fullmatch(local) is None or _DOMAIN_RE.fullmatch(email_domain) is None:
             return email, domain, 'Invalid', 'Invalid email syntax'
         
+        if domain in self._trusted_domains:
+            return email, domain, 'Valid', 'trusted-domain (syntax only)'
+        
         try:
             # Get MX records
             mx_records = self.get_mx_records(domain)
@@ -105,21 +522,399 @@ class EmailValidator:
         except Exception as e:
             return email, domain, 'Error', f'Validation error: {str(e)}'
     
-    def validate_emails_batch(self, emails: List[str]) -> Generator[Tuple[str, str, str, str], None, None]:
-        """Validate emails in batches using threading."""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all emails for validation
-            future_to_email = {
-                executor.submit(self.validate_single_email, email): email 
-                for email in emails
-            }
+    def _group_by_domain(self, emails: List[str], domains: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Normalize emails and bucket them by domain; addresses without one go under ''."""
+        if domains is None:
+            domains = [None] * len(emails)
+        
+        buckets = defaultdict(list)
+        for email, domain in zip(emails, domains):
+            email = email.strip().lower()
+            if domain is None:
+                at = email.rfind('@')
+                domain = email[at + 1:] if at >= 0 else ''
+            buckets[domain].append(email)
+        return buckets
+    
+    def _screen_bucket(self, domain: str, emails: List[str]) -> Tuple[List[Tuple[str, str, str, str]], List[str]]:
+        """Settle what needs no network (format, domain, syntax, trusted domains); return those results and the rest."""
+        if not domain:
+            return [(email, '', 'Invalid', 'Invalid email format') for email in emails], []
+        if _domain_malformed(domain):
+            return [(email, domain, 'Invalid', 'Malformed domain') for email in emails], []
+        
+        results, candidates = [], []
+        domain_ok = _DOMAIN_RE.fullmatch(domain) is not None  # Checked once for the whole bucket
+        for email in emails:
+            if _address_ok(email, domain, domain_ok):
+                candidates.append(email)
+            else:
+                results.append((email, domain, 'Invalid', 'Invalid email syntax'))
+        if candidates and domain in self._trusted_domains:
+            results.extend((email, domain, 'Valid', 'trusted-domain (syntax only)') for email in candidates)
+            candidates = []
+        return results, candidates
+    
+    @staticmethod
+    def _rcpt_verdict(email: str, domain: str, is_valid: bool, message: str) -> Tuple[str, str, str, str]:
+        """Map an RCPT result to a validation result."""
+        return (email, domain, 'Valid', '') if is_valid else (email, domain, 'Invalid', message)
+    
+    def _validate_domain_bucket(self, domain: str, emails: List[str]) -> Generator[Tuple[str, str, str, str], None, None]:
+        """Validate addresses sharing a domain with one MX lookup and one SMTP session."""
+        results, candidates = self._screen_bucket(domain, emails)
+        yield from results
+        if not candidates:
+            return
+        
+        try:
+            mx_records = self.get_mx_records(domain)
+        except Exception as e:
+            yield from ((email, domain, 'Error', f'Validation error: {str(e)}') for email in candidates)
+            return
+        if not mx_records:
+            yield from ((email, domain, 'Invalid', 'No MX records found') for email in candidates)
+            return
+        
+        # Unless the verdict is cached, RCPT a random mailbox first and wait for its reply before sending the rest
+        catch_all = self._catch_all_verdict(domain)
+        replies = None
+        if catch_all is None:
+            replies = self.validate_smtp_bucket([f'{secrets.token_hex(12)}@{domain}'] + candidates, mx_records, probe_first=True)
+            _, accepted, reason = next(replies)
+            catch_all = self._record_catch_all(domain, accepted, reason)
+        if catch_all:
+            # The server accepts any mailbox, so per-address replies say nothing; none are sent
+            if replies is not None:
+                replies.close()
+            yield from ((email, domain, 'Unknown', 'catch-all MX') for email in candidates)
+            return
+        
+        if replies is None:
+            replies = self.validate_smtp_bucket(candidates, mx_records)
+        for reply in replies:
+            yield self._rcpt_verdict(reply[0], domain, *reply[1:])
+    
+    def _domain_buckets(self, emails: List[str], domains: Optional[List[str]] = None) -> List[Tuple[str, List[str]]]:
+        """Group emails by domain, splitting large domains so one SMTP transaction carries at most max_uses recipients."""
+        size = self._pool.max_uses
+        return [
+            (domain, addrs[i:i + size])
+            for domain, addrs in self._group_by_domain(emails, domains).items()
+            for i in range(0, len(addrs), size)
+        ]
+    
+    def validate_emails_batch(self, emails: Iterable[str], domains: Optional[Iterable[str]] = None) -> Generator[Tuple[str, str, str, str], None, None]:
+        """Validate emails in per-domain buckets on the worker thread pool.
+        
+        The input is consumed lazily, batch_window addresses at a time, so memory stays bounded."""
+        pairs = zip(emails, domains) if domains is not None else ((email, None) for email in emails)
+        blocked = set()  # MX hosts given up on; their remaining addresses come back as 'Not checked' errors
+        stream = self._validate_windows(pairs, blocked)
+        
+        # Stop probing an MX host that is failing (tarpitting or blocking us) instead of timing out on each
+        # of its addresses; other hosts are counted separately and carry on
+        counts = defaultdict(lambda: [0, 0])  # MX host -> [sent, failed]
+        try:
+            for result in stream:
+                yield result
+                if not result[1]:
+                    continue
+                host = self._mx_key(result[1])
+                if host in blocked:
+                    continue
+                count = counts[host]
+                count[0] += 1
+                count[1] += _is_failure(result)
+                if count[0] >= self.abort_min_results and count[1] / count[0] > self.abort_failure_rate:
+                    blocked.add(host)
+                    self._pool.close(host)  # Drop sessions to the server that was rejecting us
+        finally:
+            stream.close()
+    
+    def _mx_key(self, domain: str) -> str:
+        """The host failures are counted against: the domain's cached primary MX, else the domain itself."""
+        records = self._cached_mx(domain)
+        return records[0] if records else domain
+    
+    def _validate_windows(self, pairs: Iterable[Tuple[str, Optional[str]]], blocked: set) -> Generator[Tuple[str, str, str, str], None, None]:
+        """Validate (email, domain) pairs one window at a time, never holding more than batch_window of them."""
+        while True:
+            window = list(itertools.islice(pairs, self.batch_window))
+            if not window:
+                return
+            emails = [email.strip().lower() for email, _ in window]
+            domains = [domain for _, domain in window]
+            del window
+            
+            # Structural checks first, as in validate_single_email, so 'a@gmail' reads as a malformed domain
+            keep = [True] * len(emails)
+            malformed = {}  # Domain -> verdict; a window repeats few domains many times
+            for i, email in enumerate(emails):
+                at = email.rfind('@')
+                if at <= 0 or at == len(email) - 1:
+                    keep[i] = False
+                    yield email, domains[i] or '', 'Invalid', 'Invalid email format'
+                    continue
+                if domains[i] is None:
+                    domains[i] = email[at + 1:]
+                domain = domains[i]
+                if domain not in malformed:
+                    malformed[domain] = _domain_malformed(domain)
+                if malformed[domain]:
+                    keep[i] = False
+                    yield email, domain, 'Invalid', 'Malformed domain'
+            if not all(keep):
+                emails = list(itertools.compress(emails, keep))
+                domains = list(itertools.compress(domains, keep))
+            
+            # One bulk syntax pass per window; only well-formed addresses reach DNS and SMTP
+            syntax_ok = self.filter_syntax_bulk(emails)
+            if not all(syntax_ok):
+                for email, domain, ok in zip(emails, domains, syntax_ok):
+                    if not ok:
+                        yield email, domain, 'Invalid', 'Invalid email syntax'
+                emails = list(itertools.compress(emails, syntax_ok))
+                domains = list(itertools.compress(domains, syntax_ok))
+            
+            # The thread pool shares the pooled SMTP sessions; asyncio is opt-in via validate_emails_batch_async
+            yield from self._validate_buckets_threaded(emails, domains, blocked)
+    
+    def _validate_buckets_threaded(self, emails: List[str], domains: Optional[List[str]], blocked: set) -> Generator[Tuple[str, str, str, str], None, None]:
+        """Validate domain buckets on the worker threads, yielding results as they complete.
+        
+        Buckets whose MX host is in blocked are skipped, or cut short, and their addresses reported as not checked."""
+        results = queue.Queue()
+        stop = threading.Event()
+        
+        def run_bucket(domain: str, bucket: List[str]):
+            pending = list(bucket)  # Addresses still owed a result
+            error = None
+            try:
+                if self._mx_key(domain) not in blocked:
+                    for result in self._validate_domain_bucket(domain, bucket):
+                        if stop.is_set():
+                            return
+                        results.put(result)
+                        pending.remove(result[0])
+                        if self._mx_key(domain) in blocked:
+                            break
+            except Exception as e:
+                error = f'Processing error: {str(e)}'
+            finally:
+                if not stop.is_set():
+                    for email in pending:
+                        results.put((email, domain, 'Error', error or 'Not checked: too many failures on its MX host'))
+                results.put(None)  # Bucket finished
+        
+        buckets = self._domain_buckets(emails, domains)
+        
+        # Resolve all uncached domains concurrently up front so bucket workers hit the MX cache
+        unresolved = {domain for domain, _ in buckets if domain and domain not in self._trusted_domains and self._cached_mx(domain) is None}
+        if unresolved:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self._prefetch_mx(unresolved)
+            else:
+                # This thread already runs an event loop (Jupyter, async handlers); resolve on a worker instead
+                self._executor.submit(self._prefetch_mx, unresolved).result()
+        
+        # Keep a sliding window of buckets in flight, submitting the next as each one finishes
+        queued = iter(buckets)
+        futures = set()
+        
+        def submit_next() -> int:
+            for domain, bucket in itertools.islice(queued, 1):
+                future = self._executor.submit(run_bucket, domain, bucket)
+                futures.add(future)
+                future.add_done_callback(futures.discard)
+                return 1
+            return 0
+        
+        try:
+            in_flight = sum(submit_next() for _ in range(self.max_workers * 4))
             
-            # Yield results as they complete
-            for future in as_completed(future_to_email):
+            # Yield results as each recipient completes
+            while in_flight:
+                result = results.get()
+                if result is None:
+                    in_flight += submit_next() - 1
+                else:
+                    yield result
+        finally:
+            # Abandoned early: skip queued buckets and stop running ones at their next result
+            stop.set()
+            for future in list(futures):
+                future.cancel()
+    
+    async def get_mx_records_async(self, domain: str, resolver) -> List[str]:
+        """Get MX records for a domain using an aiodns resolver, served from the shared MX cache when fresh."""
+        records = self._cached_mx(domain)
+        if records is not None:
+            return records
+        
+        # Retry a transient failure once after a short backoff before reporting it
+        for attempt in range(self.dns_retries + 1):
+            try:
+                return await self._query_mx_async(domain, resolver)
+            except _DNSTransient:
+                if attempt == self.dns_retries:
+                    raise
+                await asyncio.sleep(0.25 * 2 ** attempt)
+    
+    async def _query_mx_async(self, domain: str, resolver) -> List[str]:
+        """Resolve a domain's MX records with aiodns, caching the answer or the domain's absence."""
+        now = time.monotonic()
+        try:
+            result = await resolver.query_dns(domain.rstrip('.') + '.', 'MX')
+        except aiodns.error.DNSError as e:
+            if e.args and e.args[0] in _ARES_MISSING:
+                self._cache_mx(self._neg_cache, domain, now + self.neg_ttl, [], self.neg_cache_size)
+                return []
+            raise _DNSTransient(f'DNS lookup failed for {domain}: {e.args[-1] if e.args else e}') from e
+        
+        # The answer section may also carry the CNAME chain that led to the MX set
+        mx_records = [record for record in result.answer if hasattr(record.data, 'exchange')]
+        if not mx_records:
+            self._cache_mx(self._neg_cache, domain, now + self.neg_ttl, [], self.neg_cache_size)
+            return []
+        records = [host for _, host in sorted(
+            (record.data.priority, record.data.exchange.rstrip('.').lower()) for record in mx_records
+        )]
+        ttl = min([self.mx_ttl] + [record.ttl for record in mx_records])
+        self._cache_mx(self._mx_cache, domain, now + ttl, records, self.mx_cache_size)
+        return records
+    
+    async def validate_smtp_async(self, email: str, mx_servers: List[str]) -> Tuple[bool, str]:
+        """Validate email using an asyncio SMTP connection."""
+        if not mx_servers:
+            return False, "No MX records found"
+        
+        [(_, is_valid, message)] = [result async for result in self.validate_smtp_bucket_async([email], mx_servers)]
+        return is_valid, message
+    
+    async def validate_smtp_bucket_async(self, emails: List[str], mx_servers: List[str]) -> AsyncGenerator[Tuple[str, bool, str], None]:
+        """Validate addresses on one domain in asyncio SMTP sessions of at most max_uses recipients, yielding each RCPT result."""
+        size = self._pool.max_uses
+        for lo in range(0, len(emails), size):
+            pending = deque(emails[lo:lo + size])
+            for mx_server in mx_servers[:3]:  # Try up to 3 MX servers
+                smtp = aiosmtplib.SMTP(
+                    hostname=mx_server, port=25, local_hostname='validator.local',
+                    timeout=self.timeout, start_tls=False
+                )
                 try:
-                    result = future.result()
+                    await smtp.connect()
+                    await smtp.helo()
+                    
+                    # Try to start mail transaction
+                    try:
+                        await smtp.mail('test@validator.local')
+                    except aiosmtplib.SMTPSenderRefused:
+                        continue
+                    
+                    # Try to validate each recipient
+                    while pending:
+                        try:
+                            response = await smtp.rcpt(pending[0])
+                            code, message = response.code, response.message
+                        except aiosmtplib.SMTPRecipientRefused as e:
+                            code, message = e.code, e.message
+                        yield (pending.popleft(),) + self._rcpt_result(code, message)
+                    break
+                
+                except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+                    continue  # Try next MX server with the remaining addresses
+                finally:
+                    if smtp.is_connected:
+                        try:
+                            await smtp.quit()
+                        except aiosmtplib.SMTPException:
+                            smtp.close()
+            
+            for email in pending:
+                yield email, False, "Could not connect to any MX server"
+    
+    async def _validate_domain_bucket_async(self, domain: str, emails: List[str], resolver, mx_lookups: dict) -> AsyncGenerator[Tuple[str, str, str, str], None]:
+        """Validate addresses sharing a domain with one shared MX lookup and one SMTP session."""
+        results, candidates = self._screen_bucket(domain, emails)
+        for result in results:
+            yield result
+        if not candidates:
+            return
+        
+        # Buckets of the same domain share one lookup task
+        if domain not in mx_lookups:
+            mx_lookups[domain] = asyncio.ensure_future(self.get_mx_records_async(domain, resolver))
+        try:
+            mx_records = await mx_lookups[domain]
+        except Exception as e:
+            for email in candidates:
+                yield email, domain, 'Error', f'Validation error: {str(e)}'
+            return
+        if not mx_records:
+            for email in candidates:
+                yield email, domain, 'Invalid', 'No MX records found'
+            return
+        
+        # Unless the verdict is cached, RCPT a random mailbox first; each RCPT here is its own round trip
+        catch_all = self._catch_all_verdict(domain)
+        replies = None
+        if catch_all is None:
+            replies = self.validate_smtp_bucket_async([f'{secrets.token_hex(12)}@{domain}'] + candidates, mx_records)
+            _, accepted, reason = await replies.__anext__()
+            catch_all = self._record_catch_all(domain, accepted, reason)
+        if catch_all:
+            # The server accepts any mailbox, so per-address replies say nothing; none are sent
+            if replies is not None:
+                await replies.aclose()
+            for email in candidates:
+                yield email, domain, 'Unknown', 'catch-all MX'
+            return
+        
+        if replies is None:
+            replies = self.validate_smtp_bucket_async(candidates, mx_records)
+        async for reply in replies:
+            yield self._rcpt_verdict(reply[0], domain, *reply[1:])
+    
+    async def validate_emails_batch_async(self, emails: List[str], domains: Optional[List[str]] = None, concurrency: int = 200, per_domain_limit: int = 5) -> AsyncGenerator[Tuple[str, str, str, str], None]:
+        """Validate emails in per-domain buckets concurrently on the running event loop, yielding results as they complete."""
+        if not ASYNC_AVAILABLE:
+            raise ImportError("validate_emails_batch_async requires the aiodns (4.0 or later) and aiosmtplib packages")
+        
+        resolver = aiodns.DNSResolver(timeout=self._resolver.timeout, tries=1)  # Retries are ours, as on the sync path
+        mx_lookups = {}  # One shared lookup task per domain
+        limit = asyncio.Semaphore(concurrency)
+        domain_limits = defaultdict(lambda: asyncio.Semaphore(per_domain_limit))
+        results = asyncio.Queue()
+        
+        async def run_bucket(domain: str, bucket: List[str]):
+            done = 0
+            try:
+                # Cap SMTP sessions per domain and in total
+                async with domain_limits[domain], limit:
+                    async for result in self._validate_domain_bucket_async(domain, bucket, resolver, mx_lookups):
+                        await results.put(result)
+                        done += 1
+            except Exception as e:
+                for email in bucket[done:]:
+                    await results.put((email, domain, 'Error', f'Processing error: {str(e)}'))
+            finally:
+                await results.put(None)  # Bucket finished
+        
+        buckets = self._domain_buckets(emails, domains)
+        tasks = [asyncio.ensure_future(run_bucket(domain, bucket)) for domain, bucket in buckets]
+        try:
+            # Yield results as each recipient completes
+            remaining = len(tasks)
+            while remaining:
+                result = await results.get()
+                if result is None:
+                    remaining -= 1
+                else:
                     yield result
-                except Exception as e:
-                    email = future_to_email[future]
-                    domain = email.split('@')[1] if '@' in email else ''
-                    yield email, domain, 'Error', f'Processing error: {str(e)}'
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)